@@ -1,6 +1,12 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
+import codecs
+from collections import deque
+from contextlib import contextmanager
+from functools import lru_cache, partial
+import io
+from itertools import islice, zip_longest
 from pathlib import Path
 import re
 
@@ -44,19 +50,52 @@ from src.features.session import SessionManager
 from src.features.settings import SettingsManager
 from src.model.proxy_filter import FilterProxyModel, FilterRule
 from src.model.table_model import TextTableModel
-from src.utils.parser import parse_text
+from src.model.undo import (
+    CellEditCommand,
+    ColumnStructureCommand,
+    ResetCommand,
+    RowRemoveCommand,
+    UndoCommand,
+)
+from src.utils.parser import parse_lines
+
+
+_HALF_WIDTH_TABLE = {0x3000: 0x20, **{code: code - 0xFEE0 for code in range(0xFF01, 0xFF5F)}}
+_FULL_WIDTH_TABLE = {0x20: 0x3000, **{code: code + 0xFEE0 for code in range(0x21, 0x7F)}}
+
+
+def _is_blank(value: str) -> bool:
+    return not value or value.isspace()
 
 
 class ParseWorker(QObject):
+    progress = Signal(int)
     finished = Signal(list, str)
+    canceled = Signal()
 
-    def __init__(self, text: str, delimiter: str) -> None:
+    def __init__(self, text: str, delimiter: str, chunk_size: int = 50000) -> None:
         super().__init__()
         self._text = text
         self._delimiter = delimiter
+        self._chunk_size = chunk_size
+        self._canceled = False
+
+    def cancel(self) -> None:
+        self._canceled = True
 
     def run(self) -> None:
-        data = parse_text(self._text, delimiter=self._delimiter)
+        # Universal newlines split \n, \r\n and \r like splitlines() without building a line list.
+        stream = io.StringIO(self._text, newline=None)
+        total = stream.seek(0, io.SEEK_END)
+        stream.seek(0)
+        # Rows are left ragged: TextTableModel pads them when the data is loaded.
+        data: list[list[str]] = []
+        while stream.tell() < total:
+            if self._canceled:
+                self.canceled.emit()
+                return
+            data.extend(parse_lines(islice(stream, self._chunk_size), self._delimiter))
+            self.progress.emit(stream.tell() * 100 // total)
         self.finished.emit(data, self._text)
 
 
@@ -71,12 +110,13 @@ class MainWindow(QMainWindow):
         self._last_text = ""
         self._last_files: list[str] = []
         self._column_order_names: list[str] = []
-        self._undo_stack: list[tuple[list[list[str]], list[str]]] = []
-        self._redo_stack: list[tuple[list[list[str]], list[str]]] = []
         self._max_undo = 30
+        self._undo_stack: deque[UndoCommand] = deque(maxlen=self._max_undo)
+        self._redo_stack: deque[UndoCommand] = deque()
         self._copy_only_selected_columns = False
         self._parse_thread: QThread | None = None
         self._parse_worker: ParseWorker | None = None
+        self._parse_progress: QProgressDialog | None = None
 
         self._model = TextTableModel()
         self._proxy = FilterProxyModel()
@@ -165,6 +205,7 @@ class MainWindow(QMainWindow):
 
         self._model.modelReset.connect(self._sync_after_model_change)
         self._model.layoutChanged.connect(self._sync_after_model_change)
+        self._model.cellEdited.connect(self._on_cell_edited)
         self._proxy.rowsInserted.connect(self._update_status)
         self._proxy.rowsRemoved.connect(self._update_status)
         self._proxy.modelReset.connect(self._update_status)
@@ -616,13 +657,8 @@ class MainWindow(QMainWindow):
                 columns = list(range(len(headers)))
         else:
             columns = list(range(len(headers)))
-        lines: list[str] = []
-        for row in rows:
-            values = []
-            for col in columns:
-                value = self._proxy.data(self._proxy.index(row, col + 1), Qt.DisplayRole)
-                values.append("" if value is None else str(value))
-            lines.append(self._settings.get_delimiter().join(values))
+        delimiter = self._settings.get_delimiter()
+        lines = map(delimiter.join, self._get_proxy_data_for_rows(rows, columns))
         QGuiApplication.clipboard().setText("\n".join(lines))
         self._update_status("已复制所选行")
 
@@ -636,8 +672,8 @@ class MainWindow(QMainWindow):
         )
         if not source_rows:
             return
-        self._push_undo("删除行")
-        self._model.remove_rows(source_rows)
+        with self._batch_update():
+            self._run_command(RowRemoveCommand.capture(self._model, "删除行", source_rows))
         self._update_status("已删除所选行")
 
     def _invert_selection(self) -> None:
@@ -706,17 +742,42 @@ class MainWindow(QMainWindow):
         self._parse_thread = QThread(self)
         self._parse_worker = ParseWorker(text, delimiter)
         self._parse_worker.moveToThread(self._parse_thread)
+        self._parse_progress = QProgressDialog("正在解析...", "取消", 0, 100, self)
+        self._parse_progress.setWindowTitle("加载")
+        self._parse_progress.setWindowModality(Qt.WindowModal)
+        self._parse_progress.setMinimumDuration(500)
+        self._parse_progress.setAutoClose(False)
+        self._parse_progress.setAutoReset(False)
+        self._parse_progress.canceled.connect(self._parse_worker.cancel, Qt.DirectConnection)
         self._parse_thread.started.connect(self._parse_worker.run)
+        self._parse_worker.progress.connect(self._parse_progress.setValue)
         self._parse_worker.finished.connect(self._on_parse_finished)
-        self._parse_worker.finished.connect(self._parse_thread.quit)
-        self._parse_worker.finished.connect(self._parse_worker.deleteLater)
+        self._parse_worker.canceled.connect(self._on_parse_canceled)
+        for signal in (self._parse_worker.finished, self._parse_worker.canceled):
+            signal.connect(self._parse_thread.quit)
+            signal.connect(self._parse_worker.deleteLater)
         self._parse_thread.finished.connect(self._parse_thread.deleteLater)
         self._update_status("正在解析...")
         self._parse_thread.start()
 
+    def _close_parse_progress(self) -> None:
+        if self._parse_progress is not None:
+            self._parse_progress.close()
+            self._parse_progress.deleteLater()
+            self._parse_progress = None
+        self._parse_worker = None
+        self._parse_thread = None
+
+    def _on_parse_canceled(self) -> None:
+        self._close_parse_progress()
+        self._view.setSortingEnabled(True)
+        self._update_status("已取消加载")
+
     def _on_parse_finished(self, data: list[list[str]], text: str) -> None:
+        self._close_parse_progress()
+        previous = None
         if self._model.rowCount() > 0:
-            self._push_undo("加载数据")
+            previous = self._model.snapshot()
         self._last_text = text
         self._view.setUpdatesEnabled(False)
         self._view.setSortingEnabled(False)
@@ -738,32 +799,52 @@ class MainWindow(QMainWindow):
         self._view.setSortingEnabled(True)
         self._view.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
         self._view.setUpdatesEnabled(True)
+        if previous is not None:
+            self._push_undo(ResetCommand("加载数据", *previous, *self._model.snapshot()))
         self._update_status("数据已加载")
         self._update_undo_actions()
         if "\ufffd" in text:
             self._update_status("检测到可能的乱码，请确认编码")
-        self._parse_worker = None
-        self._parse_thread = None
 
-    def _capture_snapshot(self) -> tuple[list[list[str]], list[str]]:
-        data = [row[:] for row in self._model.get_data()]
-        headers = self._model.get_headers()[:]
-        return data, headers
+    def _on_cell_edited(self, row: int, column: int, old: str, new: str) -> None:
+        self._push_undo(CellEditCommand("编辑单元格", [(row, column, old, new)]))
 
-    def _push_undo(self, reason: str | None = None) -> None:
-        if self._model.rowCount() == 0 and not self._model.get_headers():
-            return
-        self._undo_stack.append(self._capture_snapshot())
-        if len(self._undo_stack) > self._max_undo:
-            self._undo_stack.pop(0)
+    def _push_undo(self, command: UndoCommand) -> None:
+        self._undo_stack.append(command)
         self._redo_stack.clear()
-        if reason:
-            self._update_status(f"已记录可撤销：{reason}")
+        if command.reason:
+            self._update_status(f"已记录可撤销：{command.reason}")
         self._update_undo_actions()
 
-    def _restore_snapshot(self, snapshot: tuple[list[list[str]], list[str]]) -> None:
-        data, headers = snapshot
-        self._model.set_data([row[:] for row in data], headers=headers[:])
+    def _run_command(self, command: UndoCommand) -> None:
+        command.apply(self._model)
+        self._push_undo(command)
+
+    @contextmanager
+    def _record_undo(self, reason: str):
+        self._model.begin_edit_log()
+        try:
+            yield
+        finally:
+            edits = self._model.end_edit_log()
+        if edits:
+            self._push_undo(CellEditCommand(reason, edits))
+
+    @contextmanager
+    def _batch_update(self):
+        # Model signals stay connected: each batch edit already emits a single
+        # dataChanged or a model reset, and the proxy must see resets.
+        self._view.setUpdatesEnabled(False)
+        self._proxy.setDynamicSortFilter(False)
+        try:
+            yield
+        finally:
+            self._proxy.setDynamicSortFilter(True)
+            if self._proxy.is_filtering():
+                self._proxy.refilter()
+            self._view.setUpdatesEnabled(True)
+
+    def _after_history_change(self) -> None:
         self._column_order_names = self._model.get_headers()
         if self._model.rowCount() > 0:
             self._view.setColumnHidden(0, False)
@@ -776,17 +857,21 @@ class MainWindow(QMainWindow):
     def _undo(self) -> None:
         if not self._undo_stack:
             return
-        self._redo_stack.append(self._capture_snapshot())
-        snapshot = self._undo_stack.pop()
-        self._restore_snapshot(snapshot)
+        command = self._undo_stack.pop()
+        with self._batch_update():
+            command.revert(self._model)
+        self._redo_stack.append(command)
+        self._after_history_change()
         self._update_undo_actions()
 
     def _redo(self) -> None:
         if not self._redo_stack:
             return
-        self._undo_stack.append(self._capture_snapshot())
-        snapshot = self._redo_stack.pop()
-        self._restore_snapshot(snapshot)
+        command = self._redo_stack.pop()
+        with self._batch_update():
+            command.apply(self._model)
+        self._undo_stack.append(command)
+        self._after_history_change()
         self._update_undo_actions()
 
     def _update_undo_actions(self) -> None:
@@ -795,40 +880,18 @@ class MainWindow(QMainWindow):
         if hasattr(self, "_redo_action"):
             self._redo_action.setEnabled(bool(self._redo_stack))
 
-    def _parse_text_with_progress(self, text: str, delimiter: str) -> list[list[str]]:
-        lines = text.splitlines()
-        total = len(lines)
-        if total < 200000:
-            return parse_text(text, delimiter=delimiter)
-        progress = QProgressDialog("正在加载大文件...", "取消", 0, total, self)
-        progress.setWindowTitle("加载")
-        progress.setValue(0)
-        progress.setMinimumDuration(0)
-        rows: list[list[str]] = []
-        max_cols = 0
-        for idx, raw_line in enumerate(lines, 1):
-            if progress.wasCanceled():
-                self._update_status("已取消加载")
-                return []
-            line = raw_line.strip()
-            if not line:
-                progress.setValue(idx)
-                continue
-            parts = [part.strip() for part in line.split(delimiter)]
-            rows.append(parts)
-            max_cols = max(max_cols, len(parts))
-            if idx % 5000 == 0:
-                progress.setValue(idx)
-        progress.setValue(total)
-        if max_cols == 0:
-            return []
-        for row in rows:
-            if len(row) < max_cols:
-                row.extend([""] * (max_cols - len(row)))
-        return rows
-
     def _decode_text(self, raw: bytes) -> str:
-        for encoding in ("utf-8", "gb18030", "gbk"):
+        if raw.startswith(codecs.BOM_UTF8):
+            return raw.decode("utf-8-sig", errors="replace")
+        if raw.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+            return raw.decode("utf-16", errors="replace")
+        encodings = ["utf-8", "gb18030", "gbk"]
+        try:
+            # A partial multibyte sequence at the end of the sample is not an error.
+            codecs.getincrementaldecoder("utf-8")().decode(raw[:65536], final=False)
+        except UnicodeDecodeError:
+            encodings.remove("utf-8")
+        for encoding in encodings:
             try:
                 return raw.decode(encoding)
             except UnicodeDecodeError:
@@ -852,20 +915,11 @@ class MainWindow(QMainWindow):
         dialog = ColumnManagerDialog(headers, visibility)
         if dialog.exec() != QDialog.Accepted:
             return
-        self._push_undo("列管理")
         order, names, visibility = dialog.get_state()
-        original_indices = list(range(len(headers)))
-        remaining_set = set(order)
-        deleted = [idx for idx in original_indices if idx not in remaining_set]
-        if deleted:
-            self._model.remove_columns(sorted(deleted, reverse=True))
-            remaining_sorted = sorted(remaining_set)
-            index_map = {orig: new_idx for new_idx, orig in enumerate(remaining_sorted)}
-            new_order = [index_map[orig] for orig in order]
-        else:
-            new_order = order
-        self._model.reorder_columns(new_order)
-        self._model.set_headers(names)
+        command = ColumnStructureCommand.capture(self._model, "列管理", names, order)
+        if not command.is_noop():
+            with self._batch_update():
+                self._run_command(command)
         self._column_order_names = self._model.get_headers()
         for idx, visible in enumerate(visibility):
             self._view.setColumnHidden(idx + 1, not visible)
@@ -906,86 +960,84 @@ class MainWindow(QMainWindow):
         dialog.exec()
 
     def _apply_text_operation(self, op: str, params: dict, scope: str, columns: list[int]) -> None:
-        self._push_undo("批量文本")
-        if scope == "Selected Cells":
-            cells = self._get_selected_source_cells()
-            targets = [(row, col) for row, col in cells if col in columns]
-        elif scope == "Selected Rows":
-            rows = self._get_selected_source_rows()
-            targets = [(row, col) for row in rows for col in columns]
-        else:
-            targets = [(row, col) for row in range(self._model.rowCount()) for col in columns]
-
-        for row, col in targets:
-            index = self._model.index(row, col + 1)
-            value = str(self._model.data(index, Qt.DisplayRole) or "")
-            if op == "replace":
-                find = params.get("find", "")
-                replace = params.get("replace", "")
-                if params.get("regex"):
-                    try:
-                        value = re.sub(find, replace, value)
-                    except re.error:
-                        QMessageBox.warning(self, "批量工具", "无效的正则表达式。")
-                        return
-                else:
-                    value = value.replace(find, replace)
-            elif op == "prefix_suffix":
-                value = f"{params.get('prefix', '')}{value}{params.get('suffix', '')}"
-            self._model.setData(index, value)
+        transform = None
+        if op == "replace":
+            find = params.get("find", "")
+            replace = params.get("replace", "")
+            if params.get("regex"):
+                try:
+                    pattern = re.compile(find)
+                except re.error:
+                    QMessageBox.warning(self, "批量工具", "无效的正则表达式。")
+                    return
+                transform = partial(pattern.sub, replace)
+            elif find != replace:
+                transform = lambda value: value.replace(find, replace)
+        elif op == "prefix_suffix":
+            prefix = params.get("prefix", "")
+            suffix = params.get("suffix", "")
+            if prefix or suffix:
+                transform = lambda value: f"{prefix}{value}{suffix}"
+
+        if transform is not None:
+            targets = self._get_scope_targets(scope, columns)
+            with self._batch_update(), self._record_undo("批量文本"):
+                try:
+                    self._model.bulk_update(targets, transform)
+                except re.error:
+                    QMessageBox.warning(self, "批量工具", "无效的正则表达式。")
+                    return
         self._update_status("批量操作完成")
 
     def _apply_split_operation(self, params: dict, scope: str, columns: list[int]) -> None:
-        self._push_undo("拆分列")
         delimiter = params.get("delimiter", "----")
         keep_original = params.get("keep_original", False)
         rows_in_scope = self._get_scope_rows(scope)
-        data = self._model.get_data()
+        split_columns = set(columns)
         headers = self._model.get_headers()
-        offset = 0
-        for col in sorted(columns):
-            adjusted_col = col + offset
+        new_headers: list[str] = []
+        sources: list[int | None] = []
+        new_columns: dict[int, list[str]] = {}
+        for col, header in enumerate(headers):
             max_parts = 0
-            per_row_parts: list[list[str]] = []
-            for row_index, row in enumerate(data):
-                if row_index in rows_in_scope:
-                    parts = row[adjusted_col].split(delimiter)
-                else:
-                    parts = []
-                per_row_parts.append(parts)
-                max_parts = max(max_parts, len(parts))
+            if col in split_columns:
+                values = self._model.get_column(col)
+                if not any(delimiter in values[row] for row in rows_in_scope):
+                    sources.append(col)
+                    new_headers.append(header)
+                    continue
+                per_row_parts = [
+                    value.split(delimiter) if row_index in rows_in_scope else []
+                    for row_index, value in enumerate(values)
+                ]
+                max_parts = max(map(len, per_row_parts), default=0)
             if max_parts <= 1:
+                sources.append(col)
+                new_headers.append(header)
                 continue
-            new_headers = [f"{headers[adjusted_col]} 部分 {i + 1}" for i in range(max_parts)]
-            new_columns = [[""] * len(data) for _ in range(max_parts)]
-            for row_index, parts in enumerate(per_row_parts):
-                padded = parts + [""] * (max_parts - len(parts))
-                for i in range(max_parts):
-                    new_columns[i][row_index] = padded[i]
+            split_values = [list(part) for part in zip_longest(*per_row_parts, fillvalue="")]
             if keep_original:
-                for row_index, row in enumerate(data):
-                    insert_values = [new_columns[i][row_index] for i in range(max_parts)]
-                    data[row_index] = (
-                        row[: adjusted_col + 1] + insert_values + row[adjusted_col + 1 :]
-                    )
-                headers = headers[: adjusted_col + 1] + new_headers + headers[adjusted_col + 1 :]
-                offset += max_parts
+                sources.append(col)
+                new_headers.append(header)
             else:
-                for row_index, row in enumerate(data):
-                    if row_index in rows_in_scope:
-                        row[adjusted_col] = new_columns[0][row_index]
-                    insert_values = [new_columns[i][row_index] for i in range(1, max_parts)]
-                    data[row_index] = (
-                        row[: adjusted_col + 1] + insert_values + row[adjusted_col + 1 :]
+                split_values[0] = [
+                    parts[0] if parts else value for parts, value in zip(per_row_parts, values)
+                ]
+            for i, column_values in enumerate(split_values):
+                new_columns[len(sources)] = column_values
+                sources.append(None)
+                new_headers.append(f"{header} 部分 {i + 1}")
+        if new_columns:
+            with self._batch_update():
+                self._run_command(
+                    ColumnStructureCommand.capture(
+                        self._model, "拆分列", new_headers, sources, new_columns
                     )
-                headers = headers[:adjusted_col] + new_headers + headers[adjusted_col + 1 :]
-                offset += max_parts - 1
-        self._model.set_data(data, headers=headers)
+                )
         self._column_order_names = self._model.get_headers()
         self._update_status("列已拆分")
 
     def _apply_merge_operation(self, params: dict, scope: str, columns: list[int]) -> None:
-        self._push_undo("合并列")
         columns = sorted(columns)
         if len(columns) < 2:
             QMessageBox.warning(self, "批量工具", "合并需要至少选择两列。")
@@ -993,88 +1045,118 @@ class MainWindow(QMainWindow):
         delimiter = params.get("delimiter", "----")
         keep_originals = params.get("keep_originals", False)
         rows_in_scope = self._get_scope_rows(scope)
-        data = self._model.get_data()
         headers = self._model.get_headers()
-        merged_values: list[str] = []
-        for row_index, row in enumerate(data):
-            if row_index in rows_in_scope:
-                merged_values.append(delimiter.join(row[i] for i in columns))
-            else:
-                merged_values.append("" if keep_originals else delimiter.join(row[i] for i in columns))
-        insert_at = columns[-1] + 1
+        merged = map(delimiter.join, zip(*(self._model.get_column(col) for col in columns)))
         if keep_originals:
-            for row_index, row in enumerate(data):
-                data[row_index] = row[:insert_at] + [merged_values[row_index]] + row[insert_at:]
-            headers = headers[:insert_at] + ["合并"] + headers[insert_at:]
+            merged_values = [
+                value if row_index in rows_in_scope else "" for row_index, value in enumerate(merged)
+            ]
         else:
-            for row_index, row in enumerate(data):
-                row[columns[0]] = merged_values[row_index]
-                for col in reversed(columns[1:]):
-                    del row[col]
-                data[row_index] = row
-            headers[columns[0]] = "合并"
-            for col in reversed(columns[1:]):
-                del headers[col]
-        self._model.set_data(data, headers=headers)
+            merged_values = list(merged)
+        if keep_originals:
+            insert_at = columns[-1] + 1
+            sources: list[int | None] = list(range(len(headers)))
+            sources.insert(insert_at, None)
+            new_headers = headers[:insert_at] + ["合并"] + headers[insert_at:]
+        else:
+            insert_at = columns[0]
+            merged_away = set(columns[1:])
+            remaining = [col for col in range(len(headers)) if col not in merged_away]
+            sources = [None if col == insert_at else col for col in remaining]
+            new_headers = ["合并" if col == insert_at else headers[col] for col in remaining]
+        with self._batch_update():
+            self._run_command(
+                ColumnStructureCommand.capture(
+                    self._model, "合并列", new_headers, sources, {insert_at: merged_values}
+                )
+            )
         self._column_order_names = self._model.get_headers()
         self._update_status("列已合并")
 
     def _apply_clean_operation(self, params: dict, scope: str, columns: list[int]) -> None:
-        self._push_undo("清理转换")
         action = params.get("action", "strip")
-        rows_in_scope = self._get_scope_rows(scope)
+        cells = self._get_selected_source_cells() if scope == "Selected Cells" else None
+        rows = self._get_selected_source_rows() if scope == "Selected Rows" else None
+        rows_in_scope = self._get_scope_rows(scope, cells, rows)
         if action == "remove_empty_rows":
-            data = self._model.get_data()
             rows_to_remove = []
             for row in rows_in_scope:
-                if all(not data[row][col].strip() for col in columns):
+                values = self._model.row_values(row)
+                if all(_is_blank(values[col]) for col in columns):
                     rows_to_remove.append(row)
-            self._model.remove_rows(sorted(rows_to_remove, reverse=True))
+            if rows_to_remove:
+                with self._batch_update():
+                    self._run_command(
+                        RowRemoveCommand.capture(self._model, "清理转换", rows_to_remove)
+                    )
             self._update_status("空行已删除")
             return
         if action == "remove_empty_cols":
-            data = self._model.get_data()
             empty_cols = []
             for col in columns:
-                if all(not data[row][col].strip() for row in range(len(data))):
+                if all(map(_is_blank, self._model.get_column(col))):
                     empty_cols.append(col)
             if empty_cols:
-                self._model.remove_columns(sorted(empty_cols, reverse=True))
+                empty = set(empty_cols)
+                headers = self._model.get_headers()
+                sources = [col for col in range(len(headers)) if col not in empty]
+                new_headers = [headers[col] for col in sources]
+                with self._batch_update():
+                    self._run_command(
+                        ColumnStructureCommand.capture(self._model, "清理转换", new_headers, sources)
+                    )
+                self._column_order_names = self._model.get_headers()
             self._update_status("空列已删除")
             return
-        if scope == "Selected Cells":
-            targets = [(row, col) for row, col in self._get_selected_source_cells() if col in columns]
-        elif scope == "Selected Rows":
-            rows = self._get_selected_source_rows()
-            targets = [(row, col) for row in rows for col in columns]
-        else:
-            targets = [(row, col) for row in range(self._model.rowCount()) for col in columns]
-
-        for row, col in targets:
-            index = self._model.index(row, col + 1)
-            value = str(self._model.data(index, Qt.DisplayRole) or "")
-            if action == "strip":
-                value = value.strip()
-            elif action == "strip_all":
-                value = "".join(value.split())
-            elif action == "upper":
-                value = value.upper()
-            elif action == "lower":
-                value = value.lower()
-            elif action == "to_half":
-                value = self._to_half_width(value)
-            elif action == "to_full":
-                value = self._to_full_width(value)
-            self._model.setData(index, value)
+        targets = self._get_scope_targets(scope, columns, cells, rows)
+        transforms = {
+            "strip": str.strip,
+            "strip_all": lambda value: "".join(value.split()),
+            "upper": str.upper,
+            "lower": str.lower,
+            "to_half": self._to_half_width,
+            "to_full": self._to_full_width,
+        }
+        transform = transforms.get(action)
+        if transform is not None:
+            with self._batch_update(), self._record_undo("清理转换"):
+                self._model.bulk_update(targets, transform)
         self._update_status("转换完成")
 
-    def _get_scope_rows(self, scope: str) -> set[int]:
+    def _get_scope_rows(
+        self,
+        scope: str,
+        cells: list[tuple[int, int]] | None = None,
+        rows: list[int] | None = None,
+    ) -> set[int]:
         if scope == "Selected Cells":
-            return {row for row, _ in self._get_selected_source_cells()}
+            if cells is None:
+                cells = self._get_selected_source_cells()
+            return {row for row, _ in cells}
         if scope == "Selected Rows":
-            return set(self._get_selected_source_rows())
+            if rows is None:
+                rows = self._get_selected_source_rows()
+            return set(rows)
         return set(range(self._model.rowCount()))
 
+    def _get_scope_targets(
+        self,
+        scope: str,
+        columns: list[int],
+        cells: list[tuple[int, int]] | None = None,
+        rows: list[int] | None = None,
+    ) -> list[tuple[int, int]]:
+        if scope == "Selected Cells":
+            if cells is None:
+                cells = self._get_selected_source_cells()
+            column_set = frozenset(columns)
+            return [(row, col) for row, col in cells if col in column_set]
+        if scope == "Selected Rows":
+            if rows is None:
+                rows = self._get_selected_source_rows()
+            return [(row, col) for row in rows for col in columns]
+        return [(row, col) for row in range(self._model.rowCount()) for col in columns]
+
     def _get_selected_source_rows(self) -> list[int]:
         selection = self._view.selectionModel()
         if not selection:
@@ -1105,36 +1187,28 @@ class MainWindow(QMainWindow):
         if not selection:
             return []
         cells = []
-        for index in selection.selectedIndexes():
-            source_index = self._proxy.mapToSource(index)
-            if source_index.column() == 0:
-                continue
-            cells.append((source_index.row(), source_index.column() - 1))
+        for selection_range in self._proxy.mapSelectionToSource(selection.selection()):
+            left = max(selection_range.left(), 1)
+            right = selection_range.right()
+            for row in range(selection_range.top(), selection_range.bottom() + 1):
+                cells.extend((row, col - 1) for col in range(left, right + 1))
         return cells
 
     def _open_dedup(self) -> None:
         headers = self._model.get_headers()
-        data = self._model.get_data()
+
+        @lru_cache(maxsize=8)
+        def row_keys(columns: tuple[int, ...]) -> list:
+            return self._model.get_row_keys(list(columns))
+
+        @lru_cache(maxsize=8)
+        def duplicate_count(columns: tuple[int, ...]) -> int:
+            keys = row_keys(columns)
+            return len(keys) - len(set(keys))
 
         def preview(columns: list[int], keep_last: bool) -> int:
-            keys = []
-            for row in data:
-                keys.append(tuple(row[i] for i in columns))
-            seen = set()
-            removed = 0
-            if keep_last:
-                for key in reversed(keys):
-                    if key in seen:
-                        removed += 1
-                    else:
-                        seen.add(key)
-            else:
-                for key in keys:
-                    if key in seen:
-                        removed += 1
-                    else:
-                        seen.add(key)
-            return removed
+            # The same number of rows goes away whichever occurrence is kept.
+            return duplicate_count(tuple(columns))
 
         dialog = DedupDialog(headers, preview)
         if dialog.exec() != QDialog.Accepted:
@@ -1143,26 +1217,16 @@ class MainWindow(QMainWindow):
         keep_last = dialog.keep_last()
         if not columns:
             return
-        keys = {}
-        result_rows: list[list[str]] = []
+        keys = row_keys(tuple(columns))
         if keep_last:
-            for idx in reversed(range(len(data))):
-                key = tuple(data[idx][i] for i in columns)
-                if key in keys:
-                    continue
-                keys[key] = idx
-                result_rows.append(data[idx])
-            result_rows.reverse()
+            kept_by_key = dict(zip(keys, range(len(keys))))
         else:
-            for row in data:
-                key = tuple(row[i] for i in columns)
-                if key in keys:
-                    continue
-                keys[key] = True
-                result_rows.append(row)
-        self._push_undo("去重")
-        self._model.set_data(result_rows, headers=headers)
-        self._column_order_names = self._model.get_headers()
+            kept_by_key = dict(zip(reversed(keys), range(len(keys) - 1, -1, -1)))
+        kept = set(kept_by_key.values())
+        duplicate_rows = [idx for idx in range(len(keys)) if idx not in kept]
+        if duplicate_rows:
+            with self._batch_update():
+                self._run_command(RowRemoveCommand.capture(self._model, "去重", duplicate_rows))
         self._update_status("去重完成")
 
     def _open_group(self) -> None:
@@ -1172,28 +1236,10 @@ class MainWindow(QMainWindow):
         dialog.exec()
 
     def _to_half_width(self, text: str) -> str:
-        result = []
-        for ch in text:
-            code = ord(ch)
-            if code == 0x3000:
-                result.append(" ")
-            elif 0xFF01 <= code <= 0xFF5E:
-                result.append(chr(code - 0xFEE0))
-            else:
-                result.append(ch)
-        return "".join(result)
+        return text.translate(_HALF_WIDTH_TABLE)
 
     def _to_full_width(self, text: str) -> str:
-        result = []
-        for ch in text:
-            code = ord(ch)
-            if code == 0x20:
-                result.append(chr(0x3000))
-            elif 0x21 <= code <= 0x7E:
-                result.append(chr(code + 0xFEE0))
-            else:
-                result.append(ch)
-        return "".join(result)
+        return text.translate(_FULL_WIDTH_TABLE)
 
 
     def _export(self, export_type: str | None) -> None:
@@ -1249,31 +1295,18 @@ class MainWindow(QMainWindow):
         self._update_status(f"已导出 {export_type}：{path}")
 
     def _get_proxy_data(self, columns: list[int]) -> list[list[str]]:
-        rows: list[list[str]] = []
-        for row in range(self._proxy.rowCount()):
-            values = []
-            for col in columns:
-                value = self._proxy.data(self._proxy.index(row, col + 1), Qt.DisplayRole)
-                values.append("" if value is None else str(value))
-            rows.append(values)
-        return rows
+        return self._get_proxy_data_for_rows(list(range(self._proxy.rowCount())), columns)
 
     def _get_proxy_data_for_rows(self, rows: list[int], columns: list[int]) -> list[list[str]]:
-        result: list[list[str]] = []
-        for row in rows:
-            values = []
-            for col in columns:
-                value = self._proxy.data(self._proxy.index(row, col + 1), Qt.DisplayRole)
-                values.append("" if value is None else str(value))
-            result.append(values)
-        return result
+        source_rows = [self._proxy.mapToSource(self._proxy.index(row, 0)).row() for row in rows]
+        return self._model.get_rows(source_rows, columns)
 
     def _update_status(self, message: str | None = None) -> None:
         visible_rows = self._proxy.rowCount()
         total_rows = self._model.rowCount()
-        columns = len(self._model.get_headers())
+        columns = self._model.data_column_count()
         selection = self._view.selectionModel()
-        selected_rows = len(selection.selectedRows()) if selection else 0
+        selected_rows = self._count_selected_rows(selection) if selection else 0
         current = self._view.currentIndex()
         if current.isValid():
             row_num = current.row() + 1
@@ -1281,9 +1314,12 @@ class MainWindow(QMainWindow):
             if current.column() == 0:
                 col_name = "序号"
             else:
-                headers = self._model.get_headers()
                 data_index = current.column() - 1
-                col_name = headers[data_index] if data_index < len(headers) else "未知"
+                col_name = (
+                    self._model.headerData(current.column(), Qt.Horizontal)
+                    if data_index < columns
+                    else "未知"
+                )
             cursor_info = f"当前：第{row_num}行 第{col_num}列（{col_name}）"
         else:
             cursor_info = "当前：无"
@@ -1296,6 +1332,23 @@ class MainWindow(QMainWindow):
             status = f"{message} | {status}"
         self._status.showMessage(status)
 
+    def _count_selected_rows(self, selection: QItemSelectionModel) -> int:
+        # Same count as len(selectedRows()) without building an index per selected row.
+        last_column = self._proxy.columnCount() - 1
+        spans = []
+        for selected in selection.selection():
+            if selected.left() != 0 or selected.right() != last_column:
+                return len(selection.selectedRows())
+            spans.append((selected.top(), selected.bottom()))
+        spans.sort()
+        count = 0
+        end = -1
+        for top, bottom in spans:
+            if bottom > end:
+                count += bottom - max(top, end + 1) + 1
+                end = bottom
+        return count
+
     def dragEnterEvent(self, event: QDragEnterEvent) -> None:
         mime = event.mimeData()
         if mime.hasUrls() or mime.hasText():
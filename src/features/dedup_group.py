@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 from collections import Counter
+from operator import itemgetter
 from pathlib import Path
 import csv
 
@@ -122,10 +123,11 @@ class GroupDialog(QDialog):
         ]
         if not columns:
             return
-        counter: Counter[tuple[str, ...]] = Counter()
-        for row in self._data:
-            key = tuple(row[i] for i in columns)
-            counter[key] += 1
+        if len(columns) > 1:
+            key_of = itemgetter(*columns)
+        else:
+            key_of = lambda row, col=columns[0]: (row[col],)
+        counter: Counter[tuple[str, ...]] = Counter(map(key_of, self._data))
         result_rows: list[list[str]] = []
         for key, count in counter.items():
             result_rows.append(list(key) + [str(count)])
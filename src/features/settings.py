@@ -8,142 +8,116 @@ from PySide6.QtCore import QSettings, QByteArray
 class SettingsManager:
     def __init__(self) -> None:
         self._settings = QSettings("TextTable", "TextTable")
+        # Raw stored values; JSON is still decoded per call so callers get fresh objects.
+        self._cache: dict[str, object] = {}
+
+    def _value(self, key: str, default: object = None) -> object:
+        if key not in self._cache:
+            self._cache[key] = self._settings.value(key)
+        value = self._cache[key]
+        return default if value is None else value
+
+    def _set_value(self, key: str, value: object) -> None:
+        self._settings.setValue(key, value)
+        self._cache[key] = value
+
+    def _get_json(self, key: str, default, expected_type: type):
+        value = self._value(key)
+        if not value:
+            return default
+        try:
+            data = json.loads(str(value))
+        except json.JSONDecodeError:
+            return default
+        return data if isinstance(data, expected_type) else default
 
     def save_geometry(self, geometry: QByteArray) -> None:
-        self._settings.setValue("window/geometry", geometry)
+        self._set_value("window/geometry", geometry)
 
     def load_geometry(self) -> QByteArray | None:
-        value = self._settings.value("window/geometry")
+        value = self._value("window/geometry")
         return value if isinstance(value, QByteArray) else None
 
     def set_delimiter(self, delimiter: str) -> None:
-        self._settings.setValue("parser/delimiter", delimiter)
+        self._set_value("parser/delimiter", delimiter)
 
     def get_delimiter(self) -> str:
-        value = self._settings.value("parser/delimiter", "----")
+        value = self._value("parser/delimiter", "----")
         return str(value)
 
     def set_column_state(self, state: dict) -> None:
-        self._settings.setValue("columns/state", json.dumps(state))
+        self._set_value("columns/state", json.dumps(state))
 
     def get_column_state(self) -> dict | None:
-        value = self._settings.value("columns/state")
-        if not value:
-            return None
-        try:
-            return json.loads(str(value))
-        except json.JSONDecodeError:
-            return None
+        return self._get_json("columns/state", None, dict)
 
     def set_filters(self, filters: list[dict]) -> None:
-        self._settings.setValue("filters/active", json.dumps(filters))
+        self._set_value("filters/active", json.dumps(filters))
 
     def get_filters(self) -> list[dict]:
-        value = self._settings.value("filters/active")
-        if not value:
-            return []
-        try:
-            data = json.loads(str(value))
-            return data if isinstance(data, list) else []
-        except json.JSONDecodeError:
-            return []
+        return self._get_json("filters/active", [], list)
 
     def set_global_filter(self, text: str) -> None:
-        self._settings.setValue("filters/global", text)
+        self._set_value("filters/global", text)
 
     def get_global_filter(self) -> str:
-        value = self._settings.value("filters/global", "")
+        value = self._value("filters/global", "")
         return str(value)
 
     def set_export_templates(self, templates: list[dict]) -> None:
-        self._settings.setValue("export/templates", json.dumps(templates))
+        self._set_value("export/templates", json.dumps(templates))
 
     def get_export_templates(self) -> list[dict]:
-        value = self._settings.value("export/templates")
-        if not value:
-            return []
-        try:
-            data = json.loads(str(value))
-            return data if isinstance(data, list) else []
-        except json.JSONDecodeError:
-            return []
+        return self._get_json("export/templates", [], list)
 
     def set_last_export_dir(self, path: str) -> None:
-        self._settings.setValue("export/last_dir", path)
+        self._set_value("export/last_dir", path)
 
     def get_last_export_dir(self) -> str:
-        value = self._settings.value("export/last_dir", "")
+        value = self._value("export/last_dir", "")
         return str(value)
 
     def set_filter_templates(self, templates: list[dict]) -> None:
-        self._settings.setValue("filters/templates", json.dumps(templates))
+        self._set_value("filters/templates", json.dumps(templates))
 
     def get_filter_templates(self) -> list[dict]:
-        value = self._settings.value("filters/templates")
-        if not value:
-            return []
-        try:
-            data = json.loads(str(value))
-            return data if isinstance(data, list) else []
-        except json.JSONDecodeError:
-            return []
+        return self._get_json("filters/templates", [], list)
 
     def set_recent_files(self, files: list[str]) -> None:
-        self._settings.setValue("session/recent_files", json.dumps(files))
+        self._set_value("session/recent_files", json.dumps(files))
 
     def get_recent_files(self) -> list[str]:
-        value = self._settings.value("session/recent_files")
-        if not value:
-            return []
-        try:
-            data = json.loads(str(value))
-            return data if isinstance(data, list) else []
-        except json.JSONDecodeError:
-            return []
+        return self._get_json("session/recent_files", [], list)
 
     def set_last_files(self, files: list[str]) -> None:
-        self._settings.setValue("session/last_files", json.dumps(files))
+        self._set_value("session/last_files", json.dumps(files))
 
     def get_last_files(self) -> list[str]:
-        value = self._settings.value("session/last_files")
-        if not value:
-            return []
-        try:
-            data = json.loads(str(value))
-            return data if isinstance(data, list) else []
-        except json.JSONDecodeError:
-            return []
+        return self._get_json("session/last_files", [], list)
 
     def set_last_text(self, text: str) -> None:
-        self._settings.setValue("session/last_text", text)
+        self._set_value("session/last_text", text)
 
     def get_last_text(self) -> str:
-        value = self._settings.value("session/last_text", "")
+        value = self._value("session/last_text", "")
         return str(value)
 
     def set_restore_enabled(self, enabled: bool) -> None:
-        self._settings.setValue("session/restore_enabled", enabled)
+        self._set_value("session/restore_enabled", enabled)
 
     def get_restore_enabled(self) -> bool:
-        value = self._settings.value("session/restore_enabled", True)
+        value = self._value("session/restore_enabled", True)
         return bool(value)
 
     def set_plugin_settings(self, data: dict) -> None:
-        self._settings.setValue("plugins/settings", json.dumps(data))
+        self._set_value("plugins/settings", json.dumps(data))
 
     def get_plugin_settings(self) -> dict:
-        value = self._settings.value("plugins/settings")
-        if not value:
-            return {}
-        try:
-            data = json.loads(str(value))
-            return data if isinstance(data, dict) else {}
-        except json.JSONDecodeError:
-            return {}
+        return self._get_json("plugins/settings", {}, dict)
 
     def set_theme(self, name: str) -> None:
-        self._settings.setValue("ui/theme", name)
+        self._set_value("ui/theme", name)
 
     def get_theme(self) -> str:
-        value = self._settings.value("ui/theme", "极简商务")
+        value = self._value("ui/theme", "极简商务")
         return str(value)
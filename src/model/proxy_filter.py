@@ -3,9 +3,12 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 import re
+from typing import Callable, Tuple
 
 from PySide6.QtCore import QSortFilterProxyModel, Qt
 
+from src.model.table_model import TextTableModel
+
 
 @dataclass
 class FilterRule:
@@ -14,52 +17,210 @@ class FilterRule:
     value: str
 
 
+# (cell, lowercased cell) -> matched; (row values, lowercased row values, joined) -> accepted
+_CellMatcher = Callable[[str, str], bool]
+_RowPredicate = Callable[[Tuple[str, ...], Tuple[str, ...], str], bool]
+# Lowercased cells are joined with a separator that a needle has to contain to span two cells.
+_CELL_SEPARATOR = "\x1f"
+_LEADING_NUMBER = re.compile(r"\s*(\d+)")
+
+
+def _never(*_args) -> bool:
+    return False
+
+
+def _compile_matcher(rule: FilterRule) -> _CellMatcher:
+    if rule.mode == "Regex":
+        try:
+            search = re.compile(rule.value, re.IGNORECASE).search
+        except re.error:
+            return _never
+        return lambda value, _lower: search(value) is not None
+    needle = rule.value.lower()
+    if rule.mode == "Contains":
+        return lambda _value, lower: needle in lower
+    if rule.mode == "Not contains":
+        return lambda _value, lower: needle not in lower
+    if rule.mode == "Equals":
+        return lambda _value, lower: lower == needle
+    if rule.mode == "Starts with":
+        return lambda _value, lower: lower.startswith(needle)
+    if rule.mode == "Ends with":
+        return lambda _value, lower: lower.endswith(needle)
+    return _never
+
+
+def _compile_rule(rule: FilterRule) -> _RowPredicate:
+    column = rule.column
+    if column is None:
+        needle = rule.value.lower()
+        if rule.mode in ("Contains", "Not contains") and _CELL_SEPARATOR not in needle:
+            if rule.mode == "Contains":
+                return lambda _values, _lowered, joined: needle in joined
+            return lambda _values, _lowered, joined: needle not in joined
+        if rule.mode == "Not contains":
+            return lambda _values, lowered, _joined: all(needle not in lower for lower in lowered)
+        match = _compile_matcher(rule)
+        return lambda values, lowered, _joined: any(map(match, values, lowered))
+    if column < 0:
+        return _never
+    match = _compile_matcher(rule)
+    return lambda values, lowered, _joined: (
+        column < len(values) and match(values[column], lowered[column])
+    )
+
+
 class FilterProxyModel(QSortFilterProxyModel):
     def __init__(self) -> None:
         super().__init__()
         self._global_filter: str = ""
+        self._global_needle = ""
         self._rules: list[FilterRule] = []
+        self._filtering = False
+        self._compiled: list[_RowPredicate] = []
+        # Lowercased cells (and their joined form) per source row, kept across filter changes.
+        self._row_cache: dict[int, tuple[tuple[str, ...], str]] = {}
+        self._cached_model = None
+        self._fast_row_values: Callable[[int], tuple[str, ...]] | None = None
+        self._data_column_count = 0
+        # Per source row keys for the column being sorted; mirrors lessThan's ordering.
+        self._sort_keys: list | None = None
+        self._sort_key_column = -1
+
+    def setSourceModel(self, model) -> None:
+        # Connected before the base class so the cache is dropped before it refilters.
+        if self._cached_model is not None:
+            self._connect_cache_signals(self._cached_model, False)
+        self._clear_row_cache()
+        self._cached_model = model
+        self._fast_row_values = model.row_values if isinstance(model, TextTableModel) else None
+        if model is not None:
+            self._connect_cache_signals(model, True)
+        self._refresh_column_count()
+        super().setSourceModel(model)
+
+    def _connect_cache_signals(self, model, connect: bool) -> None:
+        connections = [
+            (signal, self._clear_row_cache)
+            for signal in (
+                model.modelAboutToBeReset,
+                model.layoutAboutToBeChanged,
+                model.rowsAboutToBeInserted,
+                model.rowsAboutToBeRemoved,
+                model.columnsAboutToBeInserted,
+                model.columnsAboutToBeRemoved,
+            )
+        ]
+        connections += [
+            (signal, self._refresh_column_count)
+            for signal in (
+                model.modelReset,
+                model.layoutChanged,
+                model.columnsInserted,
+                model.columnsRemoved,
+                model.headerDataChanged,
+            )
+        ]
+        connections.append((model.dataChanged, self._on_source_data_changed))
+        for signal, slot in connections:
+            if connect:
+                signal.connect(slot)
+            else:
+                signal.disconnect(slot)
+
+    def _clear_row_cache(self, *_args) -> None:
+        self._row_cache.clear()
+        self._sort_keys = None
+
+    def _refresh_column_count(self, *_args) -> None:
+        model = self._cached_model
+        self._data_column_count = 0 if model is None else model.columnCount() - 1
+
+    def _on_source_data_changed(self, top_left, bottom_right, _roles=None) -> None:
+        rows = range(top_left.row(), bottom_right.row() + 1)
+        for row in rows:
+            self._row_cache.pop(row, None)
+        if self._sort_keys is None:
+            return
+        if len(self._sort_keys) != self._cached_model.rowCount():
+            self._sort_keys = None
+            return
+        for row in rows:
+            self._sort_keys[row] = self._sort_key(row, self._sort_key_column)
 
     def set_global_filter(self, text: str) -> None:
         self._global_filter = text.strip()
-        self.invalidateFilter()
+        self._global_needle = self._global_filter.lower()
+        self._refresh_filtering()
 
     def set_filters(self, rules: list[FilterRule]) -> None:
         self._rules = rules[:]
-        self.invalidateFilter()
+        self._compiled = [_compile_rule(rule) for rule in self._rules]
+        self._refresh_filtering()
 
     def add_filter(self, rule: FilterRule) -> None:
         self._rules.append(rule)
-        self.invalidateFilter()
+        self._compiled.append(_compile_rule(rule))
+        self._refresh_filtering()
 
     def clear_filters(self) -> None:
         self._rules.clear()
+        self._compiled.clear()
+        self._refresh_filtering()
+
+    def _refresh_filtering(self) -> None:
+        self._filtering = bool(self._global_filter or self._rules)
         self.invalidateFilter()
 
     def filters(self) -> list[FilterRule]:
         return self._rules[:]
 
+    def is_filtering(self) -> bool:
+        return self._filtering
+
+    def refilter(self) -> None:
+        self.invalidateFilter()
+
     def filterAcceptsRow(self, source_row: int, source_parent) -> bool:
-        model = self.sourceModel()
-        if model is None:
-            return False
-        column_count = model.columnCount() - 1
+        column_count = self._data_column_count
         if column_count <= 0:
             return False
-        row_values = [
-            str(model.data(model.index(source_row, col + 1), Qt.DisplayRole) or "")
-            for col in range(column_count)
-        ]
-        if self._global_filter:
-            needle = self._global_filter.lower()
-            if not any(needle in value.lower() for value in row_values):
+        if not self._filtering:
+            return True
+        if self._fast_row_values is not None:
+            row_values = self._fast_row_values(source_row)
+        else:
+            model = self._cached_model
+            row_values = tuple(
+                [
+                    str(model.data(model.index(source_row, col + 1), Qt.DisplayRole) or "")
+                    for col in range(column_count)
+                ]
+            )
+        cached = self._row_cache.get(source_row)
+        if cached is None:
+            lowered = tuple(map(str.lower, row_values))
+            cached = self._row_cache[source_row] = (lowered, _CELL_SEPARATOR.join(lowered))
+        lowered, joined = cached
+        needle = self._global_needle
+        if needle:
+            if _CELL_SEPARATOR in needle:
+                if not any(needle in value for value in lowered):
+                    return False
+            elif needle not in joined:
                 return False
-        for rule in self._rules:
-            if not self._apply_rule(rule, row_values):
+        for accepts in self._compiled:
+            if not accepts(row_values, lowered, joined):
                 return False
         return True
 
     def lessThan(self, left, right) -> bool:
+        column = left.column()
+        if self._fast_row_values is not None and column == right.column():
+            if self._sort_keys is None or self._sort_key_column != column:
+                self._sort_key_column = column
+                self._sort_keys = self._build_sort_keys(column)
+            return self._sort_keys[left.row()] < self._sort_keys[right.row()]
         left_value = left.data()
         right_value = right.data()
         if left.column() == 0 and right.column() == 0:
@@ -69,6 +230,25 @@ class FilterProxyModel(QSortFilterProxyModel):
                 return str(left_value) < str(right_value)
         return self._compare_with_numeric_prefix(left_value, right_value)
 
+    def _build_sort_keys(self, column: int) -> list:
+        row_count = self._cached_model.rowCount()
+        if column == 0:
+            return [self._cached_model.get_row_id(row) for row in range(row_count)]
+        texts = [self._fast_row_values(row)[column - 1] for row in range(row_count)]
+        # Columns repeat values a lot: parse each distinct value once.
+        lookup = {text: self._text_sort_key(text) for text in set(texts)}
+        return list(map(lookup.__getitem__, texts))
+
+    def _sort_key(self, source_row: int, column: int):
+        if column == 0:
+            return self._cached_model.get_row_id(source_row)
+        return self._text_sort_key(self._fast_row_values(source_row)[column - 1])
+
+    def _text_sort_key(self, text: str) -> tuple[int, int, str]:
+        number = self._leading_number(text)
+        # Cells with a leading number sort first, by number and then by text.
+        return (1, 0, text) if number is None else (0, number, text)
+
     def _compare_with_numeric_prefix(self, left_value, right_value) -> bool:
         left_text = "" if left_value is None else str(left_value)
         right_text = "" if right_value is None else str(right_value)
@@ -86,45 +266,10 @@ class FilterProxyModel(QSortFilterProxyModel):
 
     @staticmethod
     def _leading_number(text: str) -> int | None:
-        match = re.match(r"\s*(\d+)", text)
+        match = _LEADING_NUMBER.match(text)
         if not match:
             return None
         try:
             return int(match.group(1))
         except ValueError:
             return None
-
-    def _apply_rule(self, rule: FilterRule, row_values: list[str]) -> bool:
-        if rule.column is None:
-            return self._apply_rule_all_columns(rule, row_values)
-        if rule.column < 0 or rule.column >= len(row_values):
-            return False
-        return self._match_value(row_values[rule.column], rule)
-
-    def _apply_rule_all_columns(self, rule: FilterRule, row_values: list[str]) -> bool:
-        if rule.mode == "Not contains":
-            needle = rule.value.lower()
-            return all(needle not in value.lower() for value in row_values)
-        return any(self._match_value(value, rule) for value in row_values)
-
-    def _match_value(self, value: str, rule: FilterRule, invert: bool = False) -> bool:
-        haystack = value
-        needle = rule.value
-        if rule.mode == "Regex":
-            try:
-                return re.search(needle, haystack, re.IGNORECASE) is not None
-            except re.error:
-                return False
-        haystack_lower = haystack.lower()
-        needle_lower = needle.lower()
-        if rule.mode == "Contains":
-            return needle_lower in haystack_lower
-        if rule.mode == "Not contains":
-            return needle_lower not in haystack_lower
-        if rule.mode == "Equals":
-            return haystack_lower == needle_lower
-        if rule.mode == "Starts with":
-            return haystack_lower.startswith(needle_lower)
-        if rule.mode == "Ends with":
-            return haystack_lower.endswith(needle_lower)
-        return False
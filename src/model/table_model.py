@@ -1,17 +1,26 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
-from typing import Iterable
+from itertools import groupby, zip_longest
+from operator import itemgetter
+from typing import Callable, Iterable
 
-from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt, Signal
+
+_MAX_ROW_SIGNAL_RUNS = 32
 
 
 class TextTableModel(QAbstractTableModel):
+    # (row, column, old, new) for edits made outside an edit log, e.g. in the view.
+    cellEdited = Signal(int, int, str, str)
+
     def __init__(self, data: list[list[str]] | None = None, headers: list[str] | None = None) -> None:
         super().__init__()
         self._headers: list[str] = headers or []
-        self._data: list[list[str]] = []
+        # Rows are immutable tuples so snapshots and undo history can share them.
+        self._data: list[tuple[str, ...]] = []
         self._row_ids: list[int] = []
+        self._edit_log: list[tuple[int, int, str, str]] | None = None
         if data is not None:
             self.set_data(data, headers=headers)
 
@@ -29,7 +38,20 @@ class TextTableModel(QAbstractTableModel):
         self.endResetModel()
 
     def get_data(self) -> list[list[str]]:
-        return [row[:] for row in self._data]
+        return [list(row) for row in self._data]
+
+    def snapshot(self) -> tuple[list[tuple[str, ...]], list[str], list[int]]:
+        return list(self._data), self._headers[:], self._row_ids[:]
+
+    def restore_snapshot(
+        self, data: list[tuple[str, ...]], headers: list[str], row_ids: list[int]
+    ) -> None:
+        # Snapshot rows are already normalized; only the outer list is copied.
+        self.beginResetModel()
+        self._data = list(data)
+        self._headers = headers[:]
+        self._row_ids = row_ids[:]
+        self.endResetModel()
 
     def get_headers(self) -> list[str]:
         return self._headers[:]
@@ -40,6 +62,92 @@ class TextTableModel(QAbstractTableModel):
     def get_row_id(self, row: int) -> int:
         return self._row_ids[row]
 
+    def get_row(self, row: int) -> list[str]:
+        return list(self._data[row])
+
+    def row_values(self, row: int) -> tuple[str, ...]:
+        return self._data[row]
+
+    def get_column(self, column: int) -> list[str]:
+        return [row[column] for row in self._data]
+
+    def get_rows(self, rows: list[int], columns: list[int]) -> list[list[str]]:
+        if len(columns) == 1:
+            column = columns[0]
+            return [[self._data[row][column]] for row in rows]
+        if not columns:
+            return [[] for _ in rows]
+        getter = itemgetter(*columns)
+        return [list(getter(self._data[row])) for row in rows]
+
+    def get_row_keys(self, columns: list[int]) -> list:
+        if not columns:
+            return [()] * len(self._data)
+        return list(map(itemgetter(*columns), self._data))
+
+    def begin_edit_log(self) -> None:
+        self._edit_log = []
+
+    def end_edit_log(self) -> list[tuple[int, int, str, str]]:
+        edits = self._edit_log or []
+        self._edit_log = None
+        return edits
+
+    def set_cell_values(self, cells: list[tuple[int, int, str]]) -> None:
+        if not cells:
+            return
+        self._write_cells(cells)
+
+    def bulk_update(self, targets: list[tuple[int, int]], transform: Callable[[str], str]) -> None:
+        changed: list[tuple[int, int, str, str]] = []
+        for row, column in targets:
+            old = self._data[row][column]
+            new = transform(old)
+            if new != old:
+                changed.append((row, column, old, new))
+        if not changed:
+            return
+        self._write_cells([(row, column, new) for row, column, _, new in changed])
+        if self._edit_log is not None:
+            self._edit_log.extend(changed)
+
+    def _write_cells(self, cells: list[tuple[int, int, str]]) -> None:
+        pending: dict[int, list[str]] = {}
+        for row, column, value in cells:
+            values = pending.get(row)
+            if values is None:
+                values = pending[row] = list(self._data[row])
+            values[column] = value
+        for row, values in pending.items():
+            self._data[row] = tuple(values)
+        columns = [column for _, column, _ in cells]
+        self.dataChanged.emit(
+            self.index(min(pending), min(columns) + 1),
+            self.index(max(pending), max(columns) + 1),
+            [Qt.DisplayRole, Qt.EditRole],
+        )
+
+    def apply_column_layout(
+        self, headers: list[str], sources: list[int | None], columns: dict[int, list[str]]
+    ) -> None:
+        self.beginResetModel()
+        self._data = self._rebuild_rows(sources, columns)
+        self._headers = headers[:]
+        self.endResetModel()
+
+    def _rebuild_rows(
+        self, sources: list[int | None], columns: dict[int, list[str]]
+    ) -> list[tuple[str, ...]]:
+        if len(sources) > 1 and not columns:
+            # Pure reorder/removal: one C-level itemgetter call per row.
+            return list(map(itemgetter(*sources), self._data))
+        if sources:
+            column_values = [
+                columns[position] if src is None else map(itemgetter(src), self._data)
+                for position, src in enumerate(sources)
+            ]
+            return list(zip(*column_values))
+        return [() for _ in self._data]
 
     def set_headers(self, headers: list[str]) -> None:
         self._headers = headers[:]
@@ -57,17 +165,68 @@ class TextTableModel(QAbstractTableModel):
             return
         self.layoutAboutToBeChanged.emit()
         self._headers = [self._headers[i] for i in order]
-        for row_index, row in enumerate(self._data):
-            self._data[row_index] = [row[i] for i in order]
+        if len(order) > 1:
+            self._data = list(map(itemgetter(*order), self._data))
         self.layoutChanged.emit()
 
     def remove_rows(self, rows: list[int]) -> None:
-        for row in rows:
-            if 0 <= row < len(self._data):
-                self.beginRemoveRows(QModelIndex(), row, row)
-                del self._data[row]
-                del self._row_ids[row]
-                self.endRemoveRows()
+        # Rows are removed one after another, so a descending run of adjacent rows is one range.
+        runs: list[tuple[int, int]] = []
+        length = len(self._data)
+        index = 0
+        while index < len(rows):
+            last = first = rows[index]
+            index += 1
+            while index < len(rows) and rows[index] == first - 1:
+                first -= 1
+                index += 1
+            first = max(first, 0)
+            last = min(last, length - 1)
+            if first > last:
+                continue
+            runs.append((first, last))
+            length -= last - first + 1
+        if len(runs) > _MAX_ROW_SIGNAL_RUNS:
+            # Every remove signal costs the sorted proxy a full pass; scattered rows go in one reset.
+            self.beginResetModel()
+            for first, last in runs:
+                del self._data[first : last + 1]
+                del self._row_ids[first : last + 1]
+            self.endResetModel()
+            return
+        for first, last in runs:
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self._data[first : last + 1]
+            del self._row_ids[first : last + 1]
+            self.endRemoveRows()
+
+    def insert_rows(self, rows: list[tuple[int, int, tuple[str, ...]]]) -> None:
+        # Rows are inserted one after another, so ascending adjacent positions are one block.
+        blocks: list[tuple[int, list[tuple[int, int, tuple[str, ...]]]]] = []
+        length = len(self._data)
+        index = 0
+        while index < len(rows):
+            position = min(max(rows[index][0], 0), length)
+            end = index + 1
+            while end < len(rows) and rows[end][0] == position + end - index:
+                end += 1
+            blocks.append((position, rows[index:end]))
+            length += end - index
+            index = end
+        if len(blocks) > _MAX_ROW_SIGNAL_RUNS:
+            self.beginResetModel()
+            for position, block in blocks:
+                self._insert_block(position, block)
+            self.endResetModel()
+            return
+        for position, block in blocks:
+            self.beginInsertRows(QModelIndex(), position, position + len(block) - 1)
+            self._insert_block(position, block)
+            self.endInsertRows()
+
+    def _insert_block(self, position: int, block: list[tuple[int, int, tuple[str, ...]]]) -> None:
+        self._data[position:position] = [tuple(values) for _, _, values in block]
+        self._row_ids[position:position] = [row_id for _, row_id, _ in block]
 
     def insert_columns(self, index: int, headers: list[str], columns_data: list[list[str]]) -> None:
         if not headers:
@@ -77,49 +236,46 @@ class TextTableModel(QAbstractTableModel):
         if index > len(self._headers):
             index = len(self._headers)
         self.beginInsertColumns(QModelIndex(), index, index + len(headers) - 1)
-        for row_index, row in enumerate(self._data):
-            insert_values = [columns_data[col_index][row_index] for col_index in range(len(headers))]
-            self._data[row_index] = row[:index] + insert_values + row[index:]
+        column_count = len(self._headers)
+        sources = [*range(index), *[None] * len(headers), *range(index, column_count)]
+        self._data = self._rebuild_rows(
+            sources, {index + offset: values for offset, values in enumerate(columns_data)}
+        )
         self._headers[index:index] = headers
         self.endInsertColumns()
 
     def remove_columns(self, columns: list[int]) -> None:
         if not columns:
             return
-        for column in sorted(columns, reverse=True):
-            if 0 <= column < len(self._headers):
-                self.beginRemoveColumns(QModelIndex(), column, column)
-                for row_index, row in enumerate(self._data):
-                    del row[column]
-                    self._data[row_index] = row
-                del self._headers[column]
-                self.endRemoveColumns()
+        valid = sorted({column for column in columns if 0 <= column < len(self._headers)}, reverse=True)
+        # One removal (and one row rebuild) per run of adjacent columns.
+        for _, run in groupby(enumerate(valid), lambda item: item[0] + item[1]):
+            run_columns = [column for _, column in run]
+            first, last = run_columns[-1], run_columns[0]
+            self.beginRemoveColumns(QModelIndex(), first, last)
+            kept = [*range(first), *range(last + 1, len(self._headers))]
+            self._data = self._rebuild_rows(kept, {})
+            del self._headers[first : last + 1]
+            self.endRemoveColumns()
 
     def split_column(self, column: int, delimiter: str, keep_original: bool) -> None:
         if not (0 <= column < len(self._headers)):
             return
-        parts_per_row: list[list[str]] = []
-        max_parts = 0
-        for row in self._data:
-            parts = row[column].split(delimiter)
-            parts_per_row.append(parts)
-            max_parts = max(max_parts, len(parts))
+        parts_per_row = [row[column].split(delimiter) for row in self._data]
+        max_parts = max(map(len, parts_per_row), default=0)
         if max_parts <= 1:
             return
         new_headers = [f"{self._headers[column]} 部分 {i + 1}" for i in range(max_parts)]
-        new_columns_data: list[list[str]] = [[] for _ in range(max_parts)]
-        for parts in parts_per_row:
-            padded = parts + [""] * (max_parts - len(parts))
-            for idx, value in enumerate(padded):
-                new_columns_data[idx].append(value)
+        new_columns_data = [list(values) for values in zip_longest(*parts_per_row, fillvalue="")]
         if keep_original:
             self.insert_columns(column + 1, new_headers, new_columns_data)
         else:
             self.layoutAboutToBeChanged.emit()
-            for row_index, row in enumerate(self._data):
-                row[column] = new_columns_data[0][row_index]
-                insert_values = [col[row_index] for col in new_columns_data[1:]]
-                self._data[row_index] = row[: column + 1] + insert_values + row[column + 1 :]
+            column_count = len(self._headers)
+            sources = [*range(column), *[None] * max_parts, *range(column + 1, column_count)]
+            self._data = self._rebuild_rows(
+                sources, {column + offset: values for offset, values in enumerate(new_columns_data)}
+            )
             self._headers[column : column + 1] = new_headers
             self.layoutChanged.emit()
 
@@ -129,20 +285,20 @@ class TextTableModel(QAbstractTableModel):
         columns = sorted(columns)
         if columns[0] < 0 or columns[-1] >= len(self._headers):
             return
-        merged_values: list[str] = []
-        for row in self._data:
-            merged_values.append(delimiter.join(row[i] for i in columns))
+        merged_values = list(map(delimiter.join, map(itemgetter(*columns), self._data)))
         merged_header = "合并"
         insert_at = columns[-1] + 1
         if keep_originals:
             self.insert_columns(insert_at, [merged_header], [merged_values])
             return
         self.layoutAboutToBeChanged.emit()
-        for row_index, row in enumerate(self._data):
-            row[columns[0]] = merged_values[row_index]
-            for col in reversed(columns[1:]):
-                del row[col]
-            self._data[row_index] = row
+        merged_away = set(columns[1:])
+        sources = [
+            None if col == columns[0] else col
+            for col in range(len(self._headers))
+            if col not in merged_away
+        ]
+        self._data = self._rebuild_rows(sources, {columns[0]: merged_values})
         self._headers[columns[0]] = merged_header
         for col in reversed(columns[1:]):
             del self._headers[col]
@@ -182,8 +338,16 @@ class TextTableModel(QAbstractTableModel):
             return False
         if not (0 <= column - 1 < len(self._headers)):
             return False
-        self._data[row][column - 1] = "" if value is None else str(value)
+        values = self._data[row]
+        old = values[column - 1]
+        new = "" if value is None else str(value)
+        self._data[row] = values[: column - 1] + (new,) + values[column:]
         self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole])
+        if new != old:
+            if self._edit_log is not None:
+                self._edit_log.append((row, column - 1, old, new))
+            else:
+                self.cellEdited.emit(row, column - 1, old, new)
         return True
 
     def flags(self, index: QModelIndex) -> Qt.ItemFlags:
@@ -211,33 +375,27 @@ class TextTableModel(QAbstractTableModel):
         if not self._data:
             return
         reverse = order == Qt.DescendingOrder
-        self.layoutAboutToBeChanged.emit()
         if column == 0:
-            combined = list(zip(self._row_ids, self._data))
-            combined.sort(key=lambda item: item[0], reverse=reverse)
-            self._row_ids = [item[0] for item in combined]
-            self._data = [item[1] for item in combined]
+            keys = self._row_ids
         else:
             data_col = column - 1
-            combined = list(zip(self._row_ids, self._data))
-            combined.sort(
-                key=lambda item: item[1][data_col] if data_col < len(item[1]) else "",
-                reverse=reverse,
-            )
-            self._row_ids = [item[0] for item in combined]
-            self._data = [item[1] for item in combined]
+            keys = [row[data_col] if data_col < len(row) else "" for row in self._data]
+        positions = sorted(range(len(keys)), key=keys.__getitem__, reverse=reverse)
+        self.layoutAboutToBeChanged.emit()
+        self._row_ids = list(map(self._row_ids.__getitem__, positions))
+        self._data = list(map(self._data.__getitem__, positions))
         self.layoutChanged.emit()
 
-    def _normalize_data(self, data: Iterable[Iterable[str]]) -> tuple[list[list[str]], int]:
-        rows: list[list[str]] = []
-        max_cols = 0
-        for row in data:
-            row_list = ["" if cell is None else str(cell) for cell in row]
-            rows.append(row_list)
-            max_cols = max(max_cols, len(row_list))
+    def _normalize_data(self, data: Iterable[Iterable[str]]) -> tuple[list[tuple[str, ...]], int]:
+        # Parser output is already str; only other cell types go through str().
+        rows: list[tuple[str, ...]] = [
+            tuple([cell if type(cell) is str else "" if cell is None else str(cell) for cell in row])
+            for row in data
+        ]
+        max_cols = max(map(len, rows), default=0)
         if max_cols == 0:
             return rows, 0
-        for row in rows:
+        for row_index, row in enumerate(rows):
             if len(row) < max_cols:
-                row.extend([""] * (max_cols - len(row)))
+                rows[row_index] = row + ("",) * (max_cols - len(row))
         return rows, max_cols
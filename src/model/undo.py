@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+
+from src.model.table_model import TextTableModel
+
+
+@dataclass
+class UndoCommand(ABC):
+    reason: str
+
+    @abstractmethod
+    def apply(self, model: TextTableModel) -> None:
+        ...
+
+    @abstractmethod
+    def revert(self, model: TextTableModel) -> None:
+        ...
+
+
+@dataclass
+class CellEditCommand(UndoCommand):
+    # (row, column, old, new)
+    edits: list[tuple[int, int, str, str]] = field(default_factory=list)
+
+    def apply(self, model: TextTableModel) -> None:
+        model.set_cell_values([(row, col, new) for row, col, _, new in self.edits])
+
+    def revert(self, model: TextTableModel) -> None:
+        model.set_cell_values([(row, col, old) for row, col, old, _ in reversed(self.edits)])
+
+
+@dataclass
+class RowRemoveCommand(UndoCommand):
+    # (row, row_id, values), ascending by row
+    removed: list[tuple[int, int, tuple[str, ...]]] = field(default_factory=list)
+
+    @classmethod
+    def capture(cls, model: TextTableModel, reason: str, rows: list[int]) -> RowRemoveCommand:
+        removed = [(row, model.get_row_id(row), model.row_values(row)) for row in sorted(set(rows))]
+        return cls(reason, removed)
+
+    def apply(self, model: TextTableModel) -> None:
+        model.remove_rows([row for row, _, _ in reversed(self.removed)])
+
+    def revert(self, model: TextTableModel) -> None:
+        model.insert_rows(self.removed)
+
+
+@dataclass
+class ColumnStructureCommand(UndoCommand):
+    before_headers: list[str] = field(default_factory=list)
+    after_headers: list[str] = field(default_factory=list)
+    # For each column after the change: the unchanged column it comes from, or None.
+    sources: list[int | None] = field(default_factory=list)
+    # Only the columns that are dropped/rewritten (before) or created/rewritten (after).
+    before_columns: dict[int, list[str]] = field(default_factory=dict)
+    after_columns: dict[int, list[str]] = field(default_factory=dict)
+
+    @classmethod
+    def capture(
+        cls,
+        model: TextTableModel,
+        reason: str,
+        headers: list[str],
+        sources: list[int | None],
+        columns: dict[int, list[str]] | None = None,
+    ) -> ColumnStructureCommand:
+        before_headers = model.get_headers()
+        kept = {src for src in sources if src is not None}
+        before_columns = {
+            col: model.get_column(col) for col in range(len(before_headers)) if col not in kept
+        }
+        return cls(reason, before_headers, headers[:], sources[:], before_columns, columns or {})
+
+    def is_noop(self) -> bool:
+        return (
+            not self.after_columns
+            and self.sources == list(range(len(self.before_headers)))
+            and self.after_headers == self.before_headers
+        )
+
+    def apply(self, model: TextTableModel) -> None:
+        model.apply_column_layout(self.after_headers, self.sources, self.after_columns)
+
+    def revert(self, model: TextTableModel) -> None:
+        inverse: list[int | None] = [None] * len(self.before_headers)
+        for position, src in enumerate(self.sources):
+            if src is not None:
+                inverse[src] = position
+        model.apply_column_layout(self.before_headers, inverse, self.before_columns)
+
+
+@dataclass
+class ResetCommand(UndoCommand):
+    before_data: list[tuple[str, ...]] = field(default_factory=list)
+    before_headers: list[str] = field(default_factory=list)
+    before_row_ids: list[int] = field(default_factory=list)
+    after_data: list[tuple[str, ...]] = field(default_factory=list)
+    after_headers: list[str] = field(default_factory=list)
+    after_row_ids: list[int] = field(default_factory=list)
+
+    def apply(self, model: TextTableModel) -> None:
+        model.restore_snapshot(self.after_data, self.after_headers, self.after_row_ids)
+
+    def revert(self, model: TextTableModel) -> None:
+        model.restore_snapshot(self.before_data, self.before_headers, self.before_row_ids)
@@ -1,16 +1,27 @@
 from __future__ import annotations
 
+from typing import Iterable
+
+
+def parse_lines(lines: Iterable[str], delimiter: str = "----") -> list[list[str]]:
+    # Every part is stripped anyway, so the whole line only needs stripping when
+    # whitespace at the delimiter's edges could match the line's own edges.
+    if delimiter != delimiter.strip():
+        return [
+            [part.strip() for part in line.split(delimiter)]
+            for line in map(str.strip, lines)
+            if line
+        ]
+    return [
+        [part.strip() for part in line.split(delimiter)]
+        for line in lines
+        if line and not line.isspace()
+    ]
+
 
 def parse_text(text: str, delimiter: str = "----") -> list[list[str]]:
-    rows: list[list[str]] = []
-    max_cols = 0
-    for raw_line in text.splitlines():
-        line = raw_line.strip()
-        if not line:
-            continue
-        parts = [part.strip() for part in line.split(delimiter)]
-        rows.append(parts)
-        max_cols = max(max_cols, len(parts))
+    rows = parse_lines(text.splitlines(), delimiter)
+    max_cols = max(map(len, rows), default=0)
     if max_cols == 0:
         return []
     for row in rows:
@@ -20,4 +31,4 @@ def parse_text(text: str, delimiter: str = "----") -> list[list[str]]:
 
 
 def rows_to_text(rows: list[list[str]], delimiter: str = "----") -> str:
-    return "\n".join(delimiter.join(row) for row in rows)
+    return "\n".join(map(delimiter.join, rows))